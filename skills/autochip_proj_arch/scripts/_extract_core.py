@@ -0,0 +1,178 @@
+"""
+Module tree walkers shared by extract_modules.py and extract_testcases.py
+
+These are the per-node hot loops of the extract scripts. They are kept in
+their own fully annotated module so it can optionally be compiled to a C
+extension with mypyc, run from this directory:
+
+    mypyc -m _extract_core
+
+The compiled extension is written next to this file and Python imports it
+in preference to the source, so the scripts pick it up without changes.
+Without it the pure-Python definitions below are used.
+"""
+
+import sys
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+
+def _intern(value: Any) -> Any:
+    """Intern strings so equal names and paths share one object"""
+    return sys.intern(value) if type(value) is str else value
+
+
+def extract_modules(data: Any, parent_name: str = "",
+                    visited: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Extract all modules from the data structure.
+
+    The module tree is walked depth-first with an explicit stack, so deep
+    hierarchies neither recurse nor copy intermediate result lists.
+
+    Args:
+        data: The JSON data to extract modules from
+        parent_name: Parent module name for tracking hierarchy
+        visited: Set of visited module names to avoid duplicates
+
+    Returns:
+        list: List of module dictionaries with hierarchy info
+    """
+    if visited is None:
+        visited = set()
+
+    modules: List[Dict[str, Any]] = []
+    # Parents are Any: a non-str root name is carried down as the path
+    stack: Deque[Tuple[Any, Any]] = deque([(data, parent_name)])
+    # Resolved $ref subtrees are shared objects, so a repeat under the same
+    # parent can be skipped by identity before any key lookups
+    seen_ids: Set[Tuple[int, Any]] = set()
+
+    while stack:
+        node, parent = stack.pop()
+
+        node_key = (id(node), parent)
+        if node_key in seen_ids:
+            continue
+        seen_ids.add(node_key)
+
+        # Check if current node is a module (has required fields)
+        if not (type(node) is dict and 'name' in node and 'filepath' in node and 'docpath' in node):
+            continue
+
+        module_name = _intern(node['name'])
+        filepath = _intern(node['filepath'])
+        docpath = _intern(node['docpath'])
+
+        # Avoid duplicates
+        full_name = sys.intern(f"{parent}/{module_name}") if parent else module_name
+        if full_name in visited:
+            continue
+        visited.add(full_name)
+
+        submodules = node.get('submodules')
+        module_info = {
+            'name': module_name,
+            'filepath': filepath,
+            'docpath': docpath,
+            'parent': parent if parent else None,
+            'full_path': full_name,
+            'has_test': 'test' in node,
+            'has_submodules': bool(submodules)
+        }
+
+        modules.append(module_info)
+
+        # Queue submodules, reversed so they are emitted in document order
+        if submodules:
+            if type(submodules) is list:
+                stack.extend(
+                    (submodule, full_name)
+                    for submodule in reversed(submodules)
+                    if type(submodule) is dict
+                )
+            elif type(submodules) is dict:
+                stack.append((submodules, full_name))
+
+    return modules
+
+
+def extract_testcases(data: Any, module_name: str = "",
+                      visited: Optional[Set[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Extract all test cases from the data structure.
+
+    The module tree is walked depth-first with an explicit stack, so deep
+    hierarchies neither recurse nor copy intermediate result lists.
+
+    Args:
+        data: The JSON data to extract test cases from
+        module_name: Current module name for context
+        visited: Set of visited modules to avoid duplicates
+
+    Returns:
+        list: List of test case dictionaries
+    """
+    if visited is None:
+        visited = set()
+
+    testcases: List[Dict[str, Any]] = []
+    # Parents are Any: a non-str root name is carried down as the path
+    stack: Deque[Tuple[Any, Any]] = deque([(data, module_name)])
+    # Resolved $ref subtrees are shared objects, so a repeat can be skipped
+    # by identity before any key lookups
+    seen_ids: Set[int] = set()
+
+    while stack:
+        node, module_path = stack.pop()
+
+        if id(node) in seen_ids:
+            continue
+        seen_ids.add(id(node))
+
+        # Check if current node is a module
+        if not (type(node) is dict and 'name' in node):
+            continue
+
+        current_module = _intern(node['name'])
+
+        # Avoid processing same module multiple times
+        if current_module in visited:
+            continue
+        visited.add(current_module)
+
+        # Extract test cases if present
+        test_config = node.get('test')
+        if test_config and type(test_config) is dict:
+            test_case_list = test_config.get('test_case', [])
+            if test_case_list and type(test_case_list) is list:
+                testbench_path = test_config.get('testbench_path', '')
+                golden_model_path = test_config.get('golden_model_path', '')
+                for idx, tc in enumerate(test_case_list):
+                    if type(tc) is dict:
+                        testcase_info = {
+                            'module': current_module,
+                            'module_path': module_path,
+                            'test_name': tc.get('name', f'test_{idx}'),
+                            'run_cmd': tc.get('run_cmd', ''),
+                            'output_log_path': tc.get('output_log_path', []),
+                            'output_wave_path': tc.get('output_wave_path', None),
+                            'testbench_path': testbench_path,
+                            'golden_model_path': golden_model_path
+                        }
+                        testcases.append(testcase_info)
+
+        # Queue submodules, reversed so they are visited in document order
+        submodules = node.get('submodules')
+        if submodules:
+            full_module_path = sys.intern(f"{module_path}/{current_module}") if module_path else current_module
+            if type(submodules) is list:
+                stack.extend(
+                    (submodule, full_module_path)
+                    for submodule in reversed(submodules)
+                    if type(submodule) is dict
+                )
+            elif type(submodules) is dict:
+                stack.append((submodules, full_module_path))
+
+    return testcases
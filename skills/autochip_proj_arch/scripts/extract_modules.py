@@ -6,12 +6,14 @@ This script extracts all module definitions from a JSON file,
 including modules referenced via $ref.
 
 Usage:
-    python extract_modules.py <schema_path> <json_path>
+    python extract_modules.py --json <json_path>
 
 Arguments:
-    schema_path: Path to the schema JSON file (for validation)
     json_path: Path to the JSON file to extract modules from
 
+Library use:
+    from extract_modules import extract_modules_from_path
+
 Returns:
     0 if successful, 1 if an error occurs
 """
@@ -20,123 +22,61 @@ import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, List, Set
-
-
-def load_json_with_refs(file_path: Path, base_dir: Path = None) -> dict:
+from typing import Dict, List
+
+# Sibling modules are imported relatively when loaded as part of the scripts
+# package, and directly when run as a script from this directory
+if __package__:
+    from ._extract_core import extract_modules
+    from .ref_loader import load_json_with_refs
+    from .resolved_cache import load_with_cache
+    from .stream_load import stream_module_tree
+else:
+    from _extract_core import extract_modules
+    from ref_loader import load_json_with_refs
+    from resolved_cache import load_with_cache
+    from stream_load import stream_module_tree
+
+# Row template for the table format, bound once and filled per module
+_TABLE_ROW = "{full_path:<40} | {filepath:<30} | {docpath:<30} | {test_status:<6}\n".format_map
+
+
+def extract_modules_from_path(json_path: Path, use_cache: bool = True, stream: bool = False) -> List[Dict]:
     """
-    Load a JSON file and resolve all $ref references recursively.
+    Load a module JSON file and extract all of its modules.
+
+    Library entry point for callers that have no schema file or command
+    line; $ref references are resolved as in the CLI.
 
     Args:
-        file_path: Path to the JSON file
-        base_dir: Base directory for resolving relative paths
+        json_path: Path to the JSON file to extract modules from
+        use_cache: Whether to use the on-disk cache of resolved $ref data
+        stream: Stream-parse the file with ijson when it is large and has no $ref
 
     Returns:
-        dict: The loaded and resolved JSON data
+        list: List of module dictionaries
     """
-    if base_dir is None:
-        base_dir = file_path.parent
-
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-
-    def resolve_refs(obj, current_base: Path):
-        """Recursively resolve $ref references"""
-        if isinstance(obj, dict):
-            if '$ref' in obj:
-                ref_path = obj['$ref']
-
-                # Resolve relative path
-                if ref_path.startswith('./') or ref_path.startswith('../'):
-                    ref_file = current_base / ref_path
-                    if not ref_file.exists():
-                        raise FileNotFoundError(f"Referenced file not found: {ref_file}")
-
-                    # Load referenced file
-                    with open(ref_file, 'r') as rf:
-                        ref_data = json.load(rf)
-
-                    # Continue resolving refs in the referenced data
-                    return resolve_refs(ref_data, ref_file.parent)
-                else:
-                    # For other types of refs, return as is
-                    return obj
-
-            # Recursively process dictionary values
-            return {k: resolve_refs(v, current_base) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            # Recursively process list items
-            return [resolve_refs(item, current_base) for item in obj]
-        else:
-            return obj
-
-    return resolve_refs(data, file_path.parent)
-
-
-def extract_modules(data: dict, parent_name: str = "", visited: Set[str] = None) -> List[Dict]:
-    """
-    Recursively extract all modules from the data structure.
+    json_path = Path(json_path)
 
-    Args:
-        data: The JSON data to extract modules from
-        parent_name: Parent module name for tracking hierarchy
-        visited: Set of visited module names to avoid duplicates
+    # Load and resolve refs, streaming large ref-free files if asked to
+    data = None
+    if stream:
+        data = stream_module_tree(json_path, ('name', 'filepath', 'docpath', 'test'))
+    if data is None:
+        data = load_with_cache(json_path, load_json_with_refs, use_cache=use_cache)
 
-    Returns:
-        list: List of module dictionaries with hierarchy info
-    """
-    if visited is None:
-        visited = set()
-
-    modules = []
-
-    # Check if current data is a module (has required fields)
-    if isinstance(data, dict) and all(key in data for key in ['name', 'filepath', 'docpath']):
-        module_name = data['name']
-
-        # Avoid duplicates
-        full_name = f"{parent_name}/{module_name}" if parent_name else module_name
-        if full_name not in visited:
-            visited.add(full_name)
-
-            module_info = {
-                'name': module_name,
-                'filepath': data.get('filepath', ''),
-                'docpath': data.get('docpath', ''),
-                'parent': parent_name if parent_name else None,
-                'full_path': full_name,
-                'has_test': 'test' in data,
-                'has_submodules': bool(data.get('submodules'))
-            }
-
-            modules.append(module_info)
-
-            # Recursively extract submodules
-            submodules = data.get('submodules')
-            if submodules:
-                if isinstance(submodules, list):
-                    for submodule in submodules:
-                        if isinstance(submodule, dict):
-                            modules.extend(
-                                extract_modules(submodule, full_name, visited)
-                            )
-                elif isinstance(submodules, dict):
-                    modules.extend(
-                        extract_modules(submodules, full_name, visited)
-                    )
-
-    return modules
+    return extract_modules(data)
 
 
 def main():
     parser = argparse.ArgumentParser(
         description='Extract all modules from autochip module JSON files'
     )
+    # Accepted for compatibility with older invocations; never read
     parser.add_argument(
         '--schema',
-        required=True,
         dest='schema_path',
-        help='Path to the schema JSON file'
+        help=argparse.SUPPRESS
     )
     parser.add_argument(
         '--json',
@@ -154,6 +94,16 @@ def main():
         '-o', '--output',
         help='Output file path (default: stdout)'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not use the on-disk cache of resolved $ref data'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream-parse large JSON files without $ref using ijson'
+    )
 
     args = parser.parse_args()
 
@@ -164,11 +114,12 @@ def main():
         return 1
 
     try:
-        # Load and resolve refs
-        data = load_json_with_refs(json_path)
-
-        # Extract modules
-        modules = extract_modules(data)
+        # Load, resolve refs and extract modules
+        modules = extract_modules_from_path(
+            json_path,
+            use_cache=not args.no_cache,
+            stream=args.stream
+        )
 
         if not modules:
             print("No modules found in the JSON file.", file=sys.stderr)
@@ -182,9 +133,13 @@ def main():
             output = open(output_path, 'w')
 
         try:
+            # Collect everything and emit it with a single write
+            lines = []
+            append = lines.append
+
             if args.format == 'json':
-                json.dump(modules, output, indent=2)
-                output.write('\n')
+                append(json.dumps(modules, indent=2))
+                append('\n')
             elif args.format == 'tree':
                 # Build tree structure
                 def build_tree(mods):
@@ -203,7 +158,7 @@ def main():
                     for i, (name, children) in enumerate(tree.items()):
                         is_last = i == len(tree) - 1
                         connector = '└── ' if is_last else '├── '
-                        output.write('  ' * indent + prefix + connector + name + '\n')
+                        append('  ' * indent + prefix + connector + name + '\n')
 
                         if children is not None:
                             new_prefix = '    ' if is_last else '│   '
@@ -213,18 +168,14 @@ def main():
                 print_tree(tree)
             else:  # table format
                 # Table header
-                output.write(f"{'Module Path':<40} | {'File':<30} | {'Doc':<30} | {'Test':<6}\n")
-                output.write('-' * 125 + '\n')
+                append(f"{'Module Path':<40} | {'File':<30} | {'Doc':<30} | {'Test':<6}\n")
+                append('-' * 125 + '\n')
                 for mod in modules:
-                    test_status = '✓' if mod['has_test'] else '-'
-                    output.write(
-                        f"{mod['full_path']:<40} | "
-                        f"{mod['filepath']:<30} | "
-                        f"{mod['docpath']:<30} | "
-                        f"{test_status:<6}\n"
-                    )
-
-            output.write(f"\nTotal: {len(modules)} module(s)\n")
+                    mod['test_status'] = '✓' if mod['has_test'] else '-'
+                    append(_TABLE_ROW(mod))
+
+            append(f"\nTotal: {len(modules)} module(s)\n")
+            output.write(''.join(lines))
 
         finally:
             if args.output:
@@ -6,12 +6,14 @@ This script extracts all test case definitions from a JSON file,
 including test cases from modules referenced via $ref.
 
 Usage:
-    python extract_testcases.py <schema_path> <json_path>
+    python extract_testcases.py --json <json_path>
 
 Arguments:
-    schema_path: Path to the schema JSON file (for validation)
     json_path: Path to the JSON file to extract test cases from
 
+Library use:
+    from extract_testcases import extract_testcases_from_path
+
 Returns:
     0 if successful, 1 if an error occurs
 """
@@ -20,132 +22,61 @@ import sys
 import json
 import argparse
 from pathlib import Path
-from typing import Dict, List, Set
-
-
-def load_json_with_refs(file_path: Path, base_dir: Path = None) -> dict:
+from typing import Dict, List
+
+# Sibling modules are imported relatively when loaded as part of the scripts
+# package, and directly when run as a script from this directory
+if __package__:
+    from ._extract_core import extract_testcases
+    from .ref_loader import load_json_with_refs
+    from .resolved_cache import load_with_cache
+    from .stream_load import stream_module_tree
+else:
+    from _extract_core import extract_testcases
+    from ref_loader import load_json_with_refs
+    from resolved_cache import load_with_cache
+    from stream_load import stream_module_tree
+
+# Row template for the table format, bound once and filled per test case
+_TABLE_ROW = "{module:<20} | {test_name:<25} | {cmd:<40} | {wave_status:<6}\n".format_map
+
+
+def extract_testcases_from_path(json_path: Path, use_cache: bool = True, stream: bool = False) -> List[Dict]:
     """
-    Load a JSON file and resolve all $ref references recursively.
+    Load a module JSON file and extract all of its test cases.
 
-    Args:
-        file_path: Path to the JSON file
-        base_dir: Base directory for resolving relative paths
-
-    Returns:
-        dict: The loaded and resolved JSON data
-    """
-    if base_dir is None:
-        base_dir = file_path.parent
-
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-
-    def resolve_refs(obj, current_base: Path):
-        """Recursively resolve $ref references"""
-        if isinstance(obj, dict):
-            if '$ref' in obj:
-                ref_path = obj['$ref']
-
-                # Resolve relative path
-                if ref_path.startswith('./') or ref_path.startswith('../'):
-                    ref_file = current_base / ref_path
-                    if not ref_file.exists():
-                        raise FileNotFoundError(f"Referenced file not found: {ref_file}")
-
-                    # Load referenced file
-                    with open(ref_file, 'r') as rf:
-                        ref_data = json.load(rf)
-
-                    # Continue resolving refs in the referenced data
-                    return resolve_refs(ref_data, ref_file.parent)
-                else:
-                    # For other types of refs, return as is
-                    return obj
-
-            # Recursively process dictionary values
-            return {k: resolve_refs(v, current_base) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            # Recursively process list items
-            return [resolve_refs(item, current_base) for item in obj]
-        else:
-            return obj
-
-    return resolve_refs(data, file_path.parent)
-
-
-def extract_testcases(data: dict, module_name: str = "", visited: Set[str] = None) -> List[Dict]:
-    """
-    Recursively extract all test cases from the data structure.
+    Library entry point for callers that have no schema file or command
+    line; $ref references are resolved as in the CLI.
 
     Args:
-        data: The JSON data to extract test cases from
-        module_name: Current module name for context
-        visited: Set of visited modules to avoid duplicates
+        json_path: Path to the JSON file to extract test cases from
+        use_cache: Whether to use the on-disk cache of resolved $ref data
+        stream: Stream-parse the file with ijson when it is large and has no $ref
 
     Returns:
         list: List of test case dictionaries
     """
-    if visited is None:
-        visited = set()
-
-    testcases = []
-
-    # Check if current data is a module
-    if isinstance(data, dict) and 'name' in data:
-        current_module = data['name']
-
-        # Avoid processing same module multiple times
-        if current_module in visited:
-            return testcases
-        visited.add(current_module)
-
-        # Extract test cases if present
-        test_config = data.get('test')
-        if test_config and isinstance(test_config, dict):
-            test_case_list = test_config.get('test_case', [])
-            if test_case_list and isinstance(test_case_list, list):
-                for idx, tc in enumerate(test_case_list):
-                    if isinstance(tc, dict):
-                        testcase_info = {
-                            'module': current_module,
-                            'module_path': module_name,
-                            'test_name': tc.get('name', f'test_{idx}'),
-                            'run_cmd': tc.get('run_cmd', ''),
-                            'output_log_path': tc.get('output_log_path', []),
-                            'output_wave_path': tc.get('output_wave_path', None),
-                            'testbench_path': test_config.get('testbench_path', ''),
-                            'golden_model_path': test_config.get('golden_model_path', '')
-                        }
-                        testcases.append(testcase_info)
-
-        # Recursively extract from submodules
-        submodules = data.get('submodules')
-        if submodules:
-            if isinstance(submodules, list):
-                for submodule in submodules:
-                    if isinstance(submodule, dict):
-                        full_module_path = f"{module_name}/{current_module}" if module_name else current_module
-                        testcases.extend(
-                            extract_testcases(submodule, full_module_path, visited)
-                        )
-            elif isinstance(submodules, dict):
-                full_module_path = f"{module_name}/{current_module}" if module_name else current_module
-                testcases.extend(
-                    extract_testcases(submodules, full_module_path, visited)
-                )
-
-    return testcases
+    json_path = Path(json_path)
+
+    # Load and resolve refs, streaming large ref-free files if asked to
+    data = None
+    if stream:
+        data = stream_module_tree(json_path, ('name', 'test'))
+    if data is None:
+        data = load_with_cache(json_path, load_json_with_refs, use_cache=use_cache)
+
+    return extract_testcases(data)
 
 
 def main():
     parser = argparse.ArgumentParser(
         description='Extract all test cases from autochip module JSON files'
     )
+    # Accepted for compatibility with older invocations; never read
     parser.add_argument(
         '--schema',
-        required=True,
         dest='schema_path',
-        help='Path to the schema JSON file'
+        help=argparse.SUPPRESS
     )
     parser.add_argument(
         '--json',
@@ -167,6 +98,16 @@ def main():
         '--filter-module',
         help='Only show test cases for a specific module'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not use the on-disk cache of resolved $ref data'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Stream-parse large JSON files without $ref using ijson'
+    )
 
     args = parser.parse_args()
 
@@ -177,11 +118,12 @@ def main():
         return 1
 
     try:
-        # Load and resolve refs
-        data = load_json_with_refs(json_path)
-
-        # Extract test cases
-        testcases = extract_testcases(data)
+        # Load, resolve refs and extract test cases
+        testcases = extract_testcases_from_path(
+            json_path,
+            use_cache=not args.no_cache,
+            stream=args.stream
+        )
 
         if not testcases:
             print("No test cases found in the JSON file.", file=sys.stderr)
@@ -202,9 +144,13 @@ def main():
             output = open(output_path, 'w')
 
         try:
+            # Collect everything and emit it with a single write
+            lines = []
+            append = lines.append
+
             if args.format == 'json':
-                json.dump(testcases, output, indent=2)
-                output.write('\n')
+                append(json.dumps(testcases, indent=2))
+                append('\n')
             elif args.format == 'summary':
                 # Group by module
                 by_module = {}
@@ -214,31 +160,27 @@ def main():
                         by_module[module] = []
                     by_module[module].append(tc)
 
-                output.write("Test Case Summary\n")
-                output.write("=" * 60 + '\n\n')
+                append("Test Case Summary\n")
+                append("=" * 60 + '\n\n')
                 for module, cases in sorted(by_module.items()):
-                    output.write(f"Module: {module}\n")
-                    output.write(f"  Total test cases: {len(cases)}\n")
+                    append(f"Module: {module}\n")
+                    append(f"  Total test cases: {len(cases)}\n")
                     for tc in cases:
-                        output.write(f"    - {tc['test_name']}\n")
-                    output.write('\n')
-                output.write(f"\nTotal modules with tests: {len(by_module)}\n")
-                output.write(f"Total test cases: {len(testcases)}\n")
+                        append(f"    - {tc['test_name']}\n")
+                    append('\n')
+                append(f"\nTotal modules with tests: {len(by_module)}\n")
+                append(f"Total test cases: {len(testcases)}\n")
             else:  # table format
                 # Table header
-                output.write(f"{'Module':<20} | {'Test Name':<25} | {'Run Command':<40} | {'Wave':<6}\n")
-                output.write('-' * 100 + '\n')
+                append(f"{'Module':<20} | {'Test Name':<25} | {'Run Command':<40} | {'Wave':<6}\n")
+                append('-' * 100 + '\n')
                 for tc in testcases:
-                    wave_status = '✓' if tc.get('output_wave_path') else '-'
-                    cmd = tc['run_cmd'][:37] + '...' if len(tc['run_cmd']) > 40 else tc['run_cmd']
-                    output.write(
-                        f"{tc['module']:<20} | "
-                        f"{tc['test_name']:<25} | "
-                        f"{cmd:<40} | "
-                        f"{wave_status:<6}\n"
-                    )
-
-            output.write(f"\nTotal: {len(testcases)} test case(s)\n")
+                    tc['wave_status'] = '✓' if tc.get('output_wave_path') else '-'
+                    tc['cmd'] = tc['run_cmd'][:37] + '...' if len(tc['run_cmd']) > 40 else tc['run_cmd']
+                    append(_TABLE_ROW(tc))
+
+            append(f"\nTotal: {len(testcases)} test case(s)\n")
+            output.write(''.join(lines))
 
         finally:
             if args.output:
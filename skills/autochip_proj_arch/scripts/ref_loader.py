@@ -0,0 +1,257 @@
+"""
+Loader for autochip module JSON files with $ref resolution
+
+Shared by extract_modules.py, extract_testcases.py and validate_schema.py.
+Referenced files are read ahead concurrently, each file is read and
+resolved once per call, and subtrees without file refs are returned as
+they are rather than copied.
+"""
+
+import json
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Set, Tuple
+
+# orjson is optional and parses much faster, but it is not a drop-in for
+# json: it rejects the NaN/Infinity literals json accepts, so documents it
+# rejects are parsed again with json (which also keeps json's error
+# messages), and it reads integers outside the 64-bit range as floats where
+# json keeps them exact
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# With orjson, files at least this large are parsed straight from a read-only
+# memory map instead of being copied into a bytes object first
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def loads_json(data: bytes):
+    """Parse JSON bytes, with orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def load_json_file(path: Path, stamps: Dict[Path, list] = None):
+    """
+    Read and parse a single JSON file.
+
+    Args:
+        path: Path to the JSON file
+        stamps: Optional dict that receives [mtime_ns, size] for the file,
+            taken from the open file so it describes the contents read
+
+    Returns:
+        The parsed JSON data
+    """
+    with open(path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        if stamps is not None:
+            stamps[Path(path).absolute()] = [st.st_mtime_ns, st.st_size]
+        if orjson is not None and st.st_size >= _MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    try:
+                        return orjson.loads(view)
+                    except orjson.JSONDecodeError:
+                        pass
+                return json.loads(mm[:])
+        return loads_json(f.read())
+
+
+def _ref_key(ref_file: Path) -> Tuple[str, str]:
+    """
+    Return the cache key of a referenced file.
+
+    A ref is opened through its unnormalized path, current_base / ref_path,
+    and its own refs resolve against that path's parent, so a file reached
+    through a symlink resolves them next to the link. The key pairs the
+    real path of the file with the real path of that parent: realpath, like
+    the OS, follows symlinks before applying '..', so equal keys always mean
+    the same file resolved against the same directory.
+    """
+    return os.path.realpath(ref_file), os.path.realpath(ref_file.parent)
+
+
+def load_json_with_refs(file_path: Path, base_dir: Path = None, loaded_files: Dict[Path, list] = None) -> dict:
+    """
+    Load a JSON file and resolve all $ref references recursively.
+
+    Args:
+        file_path: Path to the JSON file
+        base_dir: Base directory for resolving relative paths
+        loaded_files: Optional dict that receives the absolute, unnormalized
+            path of every file read, mapped to its [mtime_ns, size] at the time it was
+            read, e.g. to stamp a disk cache entry
+
+    Returns:
+        dict: The loaded and resolved JSON data
+    """
+    if base_dir is None:
+        base_dir = file_path.parent
+
+    data = load_json_file(file_path, loaded_files)
+
+    def collect_dict(obj, current_base: Path, found: Set[Path]) -> bool:
+        """Collect file $refs in a dict; see collect_refs"""
+        if '$ref' in obj:
+            ref_path = obj['$ref']
+            if ref_path.startswith('./') or ref_path.startswith('../'):
+                found.add(current_base / ref_path)
+                ref_holders.add(id(obj))
+                return True
+            return False
+
+        has_ref = False
+        for v in obj.values():
+            if collect_refs(v, current_base, found):
+                has_ref = True
+        if has_ref:
+            ref_holders.add(id(obj))
+        return has_ref
+
+    def collect_list(obj, current_base: Path, found: Set[Path]) -> bool:
+        """Collect file $refs in a list; see collect_refs"""
+        has_ref = False
+        for item in obj:
+            if collect_refs(item, current_base, found):
+                has_ref = True
+        if has_ref:
+            ref_holders.add(id(obj))
+        return has_ref
+
+    def collect_scalar(obj, current_base: Path, found: Set[Path]) -> bool:
+        """Scalars never hold a $ref"""
+        return False
+
+    # One type() lookup per node instead of successive isinstance checks
+    collect_dispatch = {dict: collect_dict, list: collect_list}
+
+    def collect_refs(obj, current_base: Path, found: Set[Path]) -> bool:
+        """
+        Collect the paths of file $refs reachable in obj.
+
+        Returns True, after recording id(obj) in ref_holders, if obj is or
+        contains such a ref.
+        """
+        return collect_dispatch.get(type(obj), collect_scalar)(obj, current_base, found)
+
+    def read_json(path: Path):
+        """Read and parse a single JSON file, or return unreadable on error"""
+        try:
+            return load_json_file(path, loaded_files)
+        except (OSError, ValueError):
+            return unreadable
+
+    ref_keys: Dict[Path, Tuple[str, str]] = {}
+
+    def ref_key(ref_file: Path) -> Tuple[str, str]:
+        """Return _ref_key(ref_file), computed once per path"""
+        key = ref_keys.get(ref_file)
+        if key is None:
+            key = ref_keys[ref_file] = _ref_key(ref_file)
+        return key
+
+    # Parsed contents of every referenced file, keyed by real path and read
+    # ahead of resolution one level of the ref graph at a time with each
+    # level's files read concurrently. Missing or invalid files are stored
+    # as unreadable so resolve_refs reports them in traversal order, exactly
+    # as before.
+    unreadable = object()
+    # ids of containers with a file $ref somewhere below them; every other
+    # subtree is returned by resolve_refs as is instead of being copied
+    ref_holders: Set[int] = set()
+    raw_cache: Dict[str, Any] = {}
+    seen: Set[Tuple[str, str]] = set()
+    pending: Set[Path] = set()
+    collect_refs(data, file_path.parent, pending)
+    while pending:
+        level: Dict[Tuple[str, str], Path] = {}
+        for path in pending:
+            key = ref_key(path)
+            if key not in seen:
+                seen.add(key)
+                level[key] = path
+
+        # A file reached under several keys is still read only once
+        to_read = {key[0]: path for key, path in level.items() if key[0] not in raw_cache}
+        paths = list(to_read.values())
+        if len(paths) > 1:
+            workers = min(32, (os.cpu_count() or 1) * 4, len(paths))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                contents = list(executor.map(read_json, paths))
+        else:
+            contents = [read_json(p) for p in paths]
+        raw_cache.update(zip(to_read, contents))
+
+        pending = set()
+        for key, path in level.items():
+            content = raw_cache[key[0]]
+            if content is not unreadable:
+                collect_refs(content, path.parent, pending)
+
+    # Resolved referenced files, keyed by _ref_key, so each file is resolved
+    # at most once per base directory even when referenced repeatedly. Every
+    # occurrence of a ref shares the one resolved object rather than a copy.
+    ref_cache: Dict[Tuple[str, str], Any] = {}
+
+    def resolve_dict(obj, current_base: Path):
+        """Resolve a dict that is, or contains, a file $ref"""
+        if '$ref' in obj:
+            ref_path = obj['$ref']
+
+            # Resolve relative path
+            if ref_path.startswith('./') or ref_path.startswith('../'):
+                ref_file = current_base / ref_path
+                key = ref_key(ref_file)
+                if key in ref_cache:
+                    return ref_cache[key]
+                if not ref_file.exists():
+                    raise FileNotFoundError(f"Referenced file not found: {ref_file}")
+
+                # Use the read-ahead copy. A file that could not be read ahead
+                # is read again: that raises its error, or, if it has since
+                # become readable (e.g. it was being saved), its refs are
+                # collected here so they are resolved like the rest; files
+                # they reach are read on demand through this same path.
+                ref_data = raw_cache.get(key[0], unreadable)
+                if ref_data is unreadable:
+                    ref_data = raw_cache[key[0]] = load_json_file(ref_file, loaded_files)
+                    collect_refs(ref_data, ref_file.parent, set())
+
+                # Continue resolving refs in the referenced data
+                resolved = resolve_refs(ref_data, ref_file.parent)
+                ref_cache[key] = resolved
+                return resolved
+            else:
+                # For other types of refs, return as is
+                return obj
+
+        # Recursively process dictionary values
+        return {k: resolve_refs(v, current_base) for k, v in obj.items()}
+
+    def resolve_list(obj, current_base: Path):
+        """Resolve a list that contains a file $ref"""
+        return [resolve_refs(item, current_base) for item in obj]
+
+    def resolve_scalar(obj, current_base: Path):
+        """Scalars are returned unchanged"""
+        return obj
+
+    # One type() lookup per node instead of successive isinstance checks
+    resolve_dispatch = {dict: resolve_dict, list: resolve_list}
+
+    def resolve_refs(obj, current_base: Path):
+        """Recursively resolve $ref references"""
+        if id(obj) not in ref_holders:
+            return obj
+        return resolve_dispatch.get(type(obj), resolve_scalar)(obj, current_base)
+
+    return resolve_refs(data, file_path.parent)
@@ -0,0 +1,98 @@
+"""
+On-disk cache for fully resolved autochip module JSON files
+
+Resolving a module file means reading and parsing every file reachable
+through $ref. This helper stores the resolved document under
+~/.cache/autochip/refs/<sha256>.json (honouring $XDG_CACHE_HOME) together
+with the path, mtime and size of every file that went into it. A later run
+reuses the entry only while all of those files are unchanged, so repeated
+invocations on an untouched project skip reading and resolution entirely.
+
+The cache is best effort: any problem reading or writing it falls back to
+resolving the file normally.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+if __package__:
+    from .ref_loader import loads_json
+else:
+    from ref_loader import loads_json
+
+
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'autochip' / 'refs'
+
+
+def _stamp(files) -> List[list]:
+    """Return sorted [path, mtime_ns, size] entries for the given files"""
+    stamps = []
+    for path in sorted(str(p) for p in files):
+        st = os.stat(path)
+        stamps.append([path, st.st_mtime_ns, st.st_size])
+    return stamps
+
+
+def _cache_file(json_path: Path) -> Path:
+    """Return the cache entry path for a root JSON file"""
+    key = hashlib.sha256(str(json_path).encode('utf-8')).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+
+def _read_entry(cache_file: Path) -> Optional[dict]:
+    """Return the cached data if every recorded file is unchanged, else None"""
+    try:
+        entry = loads_json(cache_file.read_bytes())
+        if entry['files'] != _stamp(f[0] for f in entry['files']):
+            return None
+        return entry['data']
+    except (OSError, ValueError, KeyError, TypeError, IndexError):
+        return None
+
+
+def _write_entry(cache_file: Path, files: Dict[Path, list], data) -> None:
+    """Store resolved data and the stamps of the files it was built from"""
+    try:
+        stamps = sorted([str(path), mtime_ns, size] for path, (mtime_ns, size) in files.items())
+        # json rather than orjson, which would write NaN and Infinity as null
+        payload = json.dumps({'files': stamps, 'data': data}, separators=(',', ':')).encode('utf-8')
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        tmp_file.write_bytes(payload)
+        os.replace(tmp_file, cache_file)
+    except (OSError, ValueError, TypeError):
+        pass
+
+
+def load_with_cache(json_path: Path, loader: Callable, use_cache: bool = True) -> dict:
+    """
+    Load a JSON file with all $ref references resolved, using the disk cache.
+
+    Args:
+        json_path: Path to the root JSON file
+        loader: load_json_with_refs; called as loader(path, loaded_files=dict)
+            and expected to map every file it reads to its [mtime_ns, size],
+            stat'ed when the file was read so that a file changed during the
+            load leaves a stale, and therefore rejected, entry
+        use_cache: Set to False to bypass the cache completely
+
+    Returns:
+        dict: The loaded and resolved JSON data
+    """
+    if not use_cache:
+        return loader(json_path)
+
+    json_path = Path(json_path).absolute()
+    cache_file = _cache_file(json_path)
+
+    data = _read_entry(cache_file)
+    if data is not None:
+        return data
+
+    loaded_files: Dict[Path, list] = {}
+    data = loader(json_path, loaded_files=loaded_files)
+    _write_entry(cache_file, loaded_files, data)
+    return data
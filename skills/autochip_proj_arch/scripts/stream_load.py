@@ -0,0 +1,102 @@
+"""
+Streaming loader for large autochip module JSON files
+
+Instead of materializing a whole multi-MB module file, this drives an
+ijson event parser and builds only the module skeleton the extractors
+read: the root module, its submodules (recursively), and a caller-chosen
+set of keys on each module. Every other value is parsed and discarded
+without building Python objects for it.
+
+ijson cannot follow $ref, so a file containing one is not streamed; the
+caller falls back to the normal resolving loader. The same happens when
+ijson is not installed, the file is small, or it is not valid JSON (so the
+regular loader reports the error).
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# Files smaller than this are cheaper to load in one go
+STREAM_MIN_SIZE = 1 << 20
+
+
+def stream_module_tree(json_path: Path, keep_keys: Iterable[str]) -> Optional[dict]:
+    """
+    Stream-parse a module JSON file, keeping only the module skeleton.
+
+    Args:
+        json_path: Path to the module JSON file
+        keep_keys: Keys whose values are kept on each module, in addition
+            to 'submodules', which is always followed
+
+    Returns:
+        dict: The pruned module tree, or None if the file should be loaded
+        normally instead
+    """
+    if ijson is None or Path(json_path).stat().st_size < STREAM_MIN_SIZE:
+        return None
+
+    keep_keys = frozenset(keep_keys)
+
+    root = None
+    # One [container, role, current_key] frame per open map/array. Roles:
+    # 'module' (submodules followed, keep_keys kept), 'subs' (a submodules
+    # list), 'keep' (materialized as is) and 'skip' (discarded).
+    stack = []
+
+    def role_for(is_map: bool, is_array: bool) -> str:
+        """Return the role of a value starting at the current position"""
+        if not stack:
+            return 'module' if is_map else 'skip'
+        _, role, key = stack[-1]
+        if role == 'module':
+            if key == 'submodules':
+                return 'module' if is_map else 'subs' if is_array else 'keep'
+            return 'keep' if key in keep_keys else 'skip'
+        if role == 'subs':
+            return 'module' if is_map else 'keep'
+        return role
+
+    def add(value):
+        """Attach a value to the innermost open container"""
+        nonlocal root
+        if not stack:
+            root = value
+            return
+        container, _, key = stack[-1]
+        if type(container) is dict:
+            container[key] = value
+        else:
+            container.append(value)
+
+    try:
+        with open(json_path, 'rb') as f:
+            for event, value in ijson.basic_parse(f, use_float=True):
+                if event == 'map_key':
+                    if value == '$ref':
+                        return None
+                    stack[-1][2] = value
+                elif event == 'end_map' or event == 'end_array':
+                    stack.pop()
+                else:
+                    is_map = event == 'start_map'
+                    is_array = event == 'start_array'
+                    role = role_for(is_map, is_array)
+                    if is_map or is_array:
+                        container = None
+                        if role != 'skip':
+                            container = {} if is_map else []
+                            add(container)
+                        stack.append([container, role, None])
+                    elif role != 'skip':
+                        add(value)
+    except ijson.JSONError:
+        return None
+
+    return root
@@ -18,69 +18,62 @@ Returns:
 import sys
 import json
 import argparse
+import os
 from pathlib import Path
-from urllib.parse import urljoin
-from urllib.request import url2pathname
+
+# Sibling modules are imported relatively when loaded as part of the scripts
+# package, and directly when run as a script from this directory
+if __package__:
+    from .ref_loader import load_json_file, load_json_with_refs
+    from .resolved_cache import load_with_cache
+else:
+    from ref_loader import load_json_file, load_json_with_refs
+    from resolved_cache import load_with_cache
 
 try:
-    from jsonschema import validate, ValidationError, RefResolver
+    from jsonschema import ValidationError
+    from jsonschema.exceptions import best_match
+    from jsonschema.validators import validator_for
+    from referencing import Registry, Resource
+    from referencing.jsonschema import DRAFT202012
 except ImportError:
-    print("Error: jsonschema package is required.")
+    print("Error: jsonschema package (4.18 or newer) is required.")
     print("Install it with: pip install jsonschema")
     sys.exit(1)
 
 
-def load_json_with_refs(file_path, base_dir=None):
+# Validators built by validate_json, keyed by schema path and mtime, so
+# repeated validations in one process compile each schema only once
+_validator_cache = {}
+
+
+def build_validator(schema_path):
     """
-    Load a JSON file and resolve all $ref references recursively.
+    Load a schema and compile it into a reusable validator.
+
+    The schema is checked once here, so the returned validator can be
+    passed to validate_json for any number of files.
 
     Args:
-        file_path: Path to the JSON file
-        base_dir: Base directory for resolving relative paths
+        schema_path: Path to the schema JSON file
 
     Returns:
-        dict: The loaded and resolved JSON data
+        jsonschema validator instance for the schema's draft
     """
-    if base_dir is None:
-        base_dir = Path(file_path).parent
-
-    with open(file_path, 'r') as f:
-        data = json.load(f)
-
-    def resolve_refs(obj, current_base):
-        """Recursively resolve $ref references"""
-        if isinstance(obj, dict):
-            if '$ref' in obj:
-                ref_path = obj['$ref']
-
-                # Resolve relative path
-                if ref_path.startswith('./') or ref_path.startswith('../'):
-                    ref_file = current_base / ref_path
-                    if not ref_file.exists():
-                        raise FileNotFoundError(f"Referenced file not found: {ref_file}")
-
-                    # Load referenced file
-                    with open(ref_file, 'r') as rf:
-                        ref_data = json.load(rf)
-
-                    # Continue resolving refs in the referenced data
-                    return resolve_refs(ref_data, ref_file.parent)
-                else:
-                    # For other types of refs, return as is
-                    return obj
-
-            # Recursively process dictionary values
-            return {k: resolve_refs(v, current_base) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            # Recursively process list items
-            return [resolve_refs(item, current_base) for item in obj]
-        else:
-            return obj
+    schema = load_json_file(schema_path)
 
-    return resolve_refs(data, Path(file_path).parent)
+    cls = validator_for(schema)
+    cls.check_schema(schema)
 
+    # Register the schema under its $id so its internal refs are served
+    # from the in-memory registry
+    resource = Resource.from_contents(schema, default_specification=DRAFT202012)
+    registry = Registry().with_resource(schema.get("$id", ""), resource)
 
-def validate_json(schema_path, json_path, resolve_refs=True):
+    return cls(schema, registry=registry)
+
+
+def validate_json(schema_path, json_path, resolve_refs=True, validator=None, use_cache=True):
     """
     Validate a JSON file against a schema.
 
@@ -88,32 +81,32 @@ def validate_json(schema_path, json_path, resolve_refs=True):
         schema_path: Path to the schema JSON file
         json_path: Path to the JSON file to validate
         resolve_refs: Whether to resolve $ref references before validation
+        validator: Pre-built validator from build_validator; when given,
+            schema_path is not read again. Otherwise one is built and
+            reused for later calls with the same unchanged schema file
+        use_cache: Whether to use the on-disk cache of resolved $ref data
 
     Returns:
         tuple: (is_valid: bool, error_message: str or None)
     """
     try:
-        # Load schema
-        with open(schema_path, 'r') as f:
-            schema = json.load(f)
+        # Load and compile schema, or reuse the one compiled earlier
+        if validator is None:
+            key = (Path(schema_path).resolve(), os.stat(schema_path).st_mtime_ns)
+            validator = _validator_cache.get(key)
+            if validator is None:
+                validator = _validator_cache[key] = build_validator(schema_path)
 
         # Load JSON data
         if resolve_refs:
-            data = load_json_with_refs(json_path)
+            data = load_with_cache(json_path, load_json_with_refs, use_cache=use_cache)
         else:
-            with open(json_path, 'r') as f:
-                data = json.load(f)
-
-        # Create a resolver for the schema
-        schema_dir = Path(schema_path).parent
-        schema_store = {schema.get("$id", ""): schema}
-        resolver = RefResolver.from_schema(
-            schema,
-            store=schema_store
-        )
-
-        # Validate
-        validate(instance=data, schema=schema, resolver=resolver)
+            data = load_json_file(json_path)
+
+        # Validate, reporting the most relevant error like jsonschema.validate
+        error = best_match(validator.iter_errors(data))
+        if error is not None:
+            raise error
         return True, None
 
     except FileNotFoundError as e:
@@ -147,6 +140,11 @@ def main():
         action='store_true',
         help='Do not resolve $ref references before validation'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not use the on-disk cache of resolved $ref data'
+    )
 
     args = parser.parse_args()
 
@@ -168,7 +166,8 @@ def main():
     is_valid, error_msg = validate_json(
         schema_path,
         json_path,
-        resolve_refs=not args.no_resolve_refs
+        resolve_refs=not args.no_resolve_refs,
+        use_cache=not args.no_cache
     )
 
     if is_valid:
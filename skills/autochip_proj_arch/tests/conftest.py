@@ -0,0 +1,8 @@
+"""Pytest configuration for the autochip_proj_arch skill tests."""
+
+import sys
+from pathlib import Path
+
+# Make the scripts package importable however pytest is invoked, e.g.
+# `pytest tests` from the skill directory or `pytest skills` from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,108 @@
+"""Tests for the module tree walkers in _extract_core."""
+
+import importlib.util
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+
+@pytest.fixture(scope="module")
+def compiled_core(tmp_path_factory):
+    """Build _extract_core with mypyc and import the compiled extension."""
+    pytest.importorskip("mypyc")
+    build_dir = tmp_path_factory.mktemp("mypyc")
+    shutil.copy(SCRIPTS_DIR / "_extract_core.py", build_dir)
+    result = subprocess.run(
+        [sys.executable, "-m", "mypyc", "_extract_core.py"],
+        cwd=build_dir, capture_output=True, text=True,
+    )
+    extensions = [p for p in build_dir.glob("_extract_core.*") if p.suffix in (".so", ".pyd")]
+    if result.returncode != 0 or not extensions:
+        pytest.skip(f"mypyc build failed: {result.stderr.strip()[-200:]}")
+
+    spec = importlib.util.spec_from_file_location("_extract_core", extensions[0])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=["source", "compiled"])
+def core(request):
+    """The pure-Python walkers, and the same code compiled with mypyc."""
+    if request.param == "compiled":
+        return request.getfixturevalue("compiled_core")
+    from scripts import _extract_core
+    return _extract_core
+
+
+def module(name, *submodules, **extra):
+    """Build a module node."""
+    return {"name": name, "filepath": f"{name}.v", "docpath": f"{name}.md",
+            "submodules": list(submodules) or None, **extra}
+
+
+def reference_full_paths(data, parent_name="", visited=None):
+    """Full paths in the order of the original recursive, full-path dedupe."""
+    if visited is None:
+        visited = set()
+    paths = []
+    if isinstance(data, dict) and all(key in data for key in ["name", "filepath", "docpath"]):
+        full_name = f"{parent_name}/{data['name']}" if parent_name else data["name"]
+        if full_name not in visited:
+            visited.add(full_name)
+            paths.append(full_name)
+            submodules = data.get("submodules")
+            if isinstance(submodules, list):
+                for submodule in submodules:
+                    if isinstance(submodule, dict):
+                        paths.extend(reference_full_paths(submodule, full_name, visited))
+            elif isinstance(submodules, dict):
+                paths.extend(reference_full_paths(submodules, full_name, visited))
+    return paths
+
+
+class TestExtractModules:
+    """Tests for extract_modules."""
+
+    def test_slash_in_name_dedupes_by_full_path(self, core):
+        """Test a module named 'b/c' and module c under b are emitted once."""
+        data = module("a", module("b/c"), module("b", module("c")))
+        full_paths = [m["full_path"] for m in core.extract_modules(data)]
+        assert full_paths == ["a", "a/b/c", "a/b"]
+        assert full_paths == reference_full_paths(data)
+
+    def test_shared_subtrees_match_reference(self, core):
+        """Test repeated and shared subtrees dedupe as the full-path walk does."""
+        shared = module("shared", module("leaf"))
+        data = module("top", shared, module("x", shared, shared), shared, module("x", module("y")))
+        full_paths = [m["full_path"] for m in core.extract_modules(data)]
+        assert full_paths == reference_full_paths(data)
+
+    def test_visited_holds_full_paths(self, core):
+        """Test visited is filled with full path strings."""
+        visited = set()
+        core.extract_modules(module("a", module("b")), visited=visited)
+        assert visited == {"a", "a/b"}
+
+    def test_non_str_root_name(self, core):
+        """Test a non-str root name is carried down as the parent path."""
+        data = module(5, module(6, module("x")))
+        modules = core.extract_modules(data)
+        assert [m["full_path"] for m in modules] == [5, "5/6", "5/6/x"]
+        assert [m["parent"] for m in modules] == [None, 5, "5/6"]
+
+
+class TestExtractTestcases:
+    """Tests for extract_testcases."""
+
+    def test_non_str_root_name(self, core):
+        """Test a non-str root name is carried down as the module path."""
+        test = {"test_case": [{"name": "t"}]}
+        data = module(5, module(6, test=test), test=test)
+        testcases = core.extract_testcases(data)
+        assert [(t["module"], t["module_path"]) for t in testcases] == [(5, ""), (6, 5)]
@@ -0,0 +1,109 @@
+"""Tests for $ref resolution in load_json_with_refs."""
+
+import json
+import os
+
+import pytest
+
+from scripts import ref_loader
+from scripts.ref_loader import load_json_with_refs
+
+
+def write_json(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+
+
+def symlink(link, target):
+    """Create a symlink, skipping the test where that is not permitted."""
+    link.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.symlink(target, link)
+    except (OSError, NotImplementedError):
+        pytest.skip("symlinks are not supported here")
+
+
+def names(data):
+    """Return the module names of a resolved tree, depth first."""
+    result = [data["name"]]
+    for sub in data.get("submodules") or []:
+        result.extend(names(sub))
+    return result
+
+
+class TestSymlinks:
+    """Tests that refs through symlinks resolve as the OS opens them."""
+
+    def test_symlinked_file_resolves_next_to_link(self, tmp_path):
+        """Test ./ refs in a symlinked file resolve next to the link."""
+        write_json(tmp_path / "proj" / "top.json", {"name": "top", "submodules": [{"$ref": "./core.json"}]})
+        write_json(tmp_path / "ip" / "core.json", {"name": "core", "submodules": [{"$ref": "./leaf.json"}]})
+        write_json(tmp_path / "ip" / "leaf.json", {"name": "ip_leaf"})
+        write_json(tmp_path / "proj" / "leaf.json", {"name": "proj_leaf"})
+        symlink(tmp_path / "proj" / "core.json", os.path.join("..", "ip", "core.json"))
+
+        data = load_json_with_refs(tmp_path / "proj" / "top.json")
+        assert names(data) == ["top", "core", "proj_leaf"]
+
+    def test_parent_ref_through_symlinked_directory(self, tmp_path):
+        """Test ../ through a symlinked directory follows the link target."""
+        write_json(tmp_path / "real" / "sub" / "top.json", {"name": "top", "submodules": [{"$ref": "../other.json"}]})
+        write_json(tmp_path / "real" / "other.json", {"name": "other_real"})
+        write_json(tmp_path / "p" / "other.json", {"name": "other_p"})
+        symlink(tmp_path / "p" / "sub", os.path.join("..", "real", "sub"))
+
+        data = load_json_with_refs(tmp_path / "p" / "sub" / "top.json")
+        assert names(data) == ["top", "other_real"]
+
+    def test_same_file_through_two_directories(self, tmp_path):
+        """Test one file reached from two directories resolves against each."""
+        write_json(tmp_path / "top.json", {"name": "top", "submodules": [
+            {"$ref": "./a/core.json"},
+            {"$ref": "./b/core.json"},
+        ]})
+        write_json(tmp_path / "shared" / "core.json", {"name": "core", "submodules": [{"$ref": "./leaf.json"}]})
+        write_json(tmp_path / "a" / "leaf.json", {"name": "leaf_a"})
+        write_json(tmp_path / "b" / "leaf.json", {"name": "leaf_b"})
+        symlink(tmp_path / "a" / "core.json", os.path.join("..", "shared", "core.json"))
+        symlink(tmp_path / "b" / "core.json", os.path.join("..", "shared", "core.json"))
+
+        data = load_json_with_refs(tmp_path / "top.json")
+        assert names(data) == ["top", "core", "leaf_a", "core", "leaf_b"]
+
+
+class TestReadAheadRetry:
+    """Tests for files that could not be read ahead of resolution."""
+
+    def test_file_readable_on_retry(self, tmp_path, monkeypatch):
+        """Test refs in a file that failed once, e.g. mid-save, are resolved."""
+        write_json(tmp_path / "top.json", {"name": "top", "submodules": [{"$ref": "./mid.json"}]})
+        write_json(tmp_path / "mid.json", {"name": "mid", "submodules": [{"$ref": "./leaf.json"}]})
+        write_json(tmp_path / "leaf.json", {"name": "leaf"})
+
+        load_json_file = ref_loader.load_json_file
+        failed = []
+
+        def fail_mid_once(path, *args, **kwargs):
+            if os.path.basename(path) == "mid.json" and not failed:
+                failed.append(path)
+                raise ValueError("mid-save")
+            return load_json_file(path, *args, **kwargs)
+
+        monkeypatch.setattr(ref_loader, "load_json_file", fail_mid_once)
+        loaded_files = {}
+        data = load_json_with_refs(tmp_path / "top.json", loaded_files=loaded_files)
+
+        assert failed
+        assert names(data) == ["top", "mid", "leaf"]
+        assert sorted(p.name for p in loaded_files) == ["leaf.json", "mid.json", "top.json"]
+
+
+class TestErrors:
+    """Tests for reporting missing referenced files."""
+
+    def test_missing_ref(self, tmp_path):
+        """Test a missing file raises FileNotFoundError naming the ref path."""
+        write_json(tmp_path / "top.json", {"name": "top", "submodules": [{"$ref": "./missing.json"}]})
+
+        with pytest.raises(FileNotFoundError, match="missing.json"):
+            load_json_with_refs(tmp_path / "top.json")
@@ -0,0 +1,91 @@
+"""Tests for the on-disk cache of resolved module JSON files."""
+
+import json
+import os
+
+import pytest
+
+from scripts import resolved_cache
+from scripts.ref_loader import load_json_with_refs
+from scripts.resolved_cache import load_with_cache
+
+
+def write_json(path, data):
+    """Write data as JSON and give the file a distinct, known mtime."""
+    path.write_text(json.dumps(data))
+    write_json.mtime_ns += 10 ** 9
+    os.utime(path, ns=(write_json.mtime_ns, write_json.mtime_ns))
+
+
+write_json.mtime_ns = 1_000_000_000 * 10 ** 9
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A root module referencing one leaf module, with a private cache dir."""
+    monkeypatch.setattr(resolved_cache, "CACHE_DIR", tmp_path / "cache")
+    top = tmp_path / "top.json"
+    leaf = tmp_path / "leaf.json"
+    write_json(top, {"name": "top", "submodules": [{"$ref": "./leaf.json"}]})
+    write_json(leaf, {"name": "leaf"})
+    return top, leaf
+
+
+def leaf_name(data):
+    return data["submodules"][0]["name"]
+
+
+def failing_loader(*args, **kwargs):
+    raise AssertionError("cache entry was not reused")
+
+
+class TestLoadWithCache:
+    """Tests for load_with_cache."""
+
+    def test_entry_reused(self, project):
+        """Test an unchanged project is served from the cache."""
+        top, _ = project
+        first = load_with_cache(top, load_json_with_refs)
+        assert load_with_cache(top, failing_loader) == first
+
+    def test_stale_entry_rejected(self, project):
+        """Test an entry is rejected once a referenced file changes."""
+        top, leaf = project
+        assert leaf_name(load_with_cache(top, load_json_with_refs)) == "leaf"
+
+        write_json(leaf, {"name": "leaf_v2"})
+        assert leaf_name(load_with_cache(top, load_json_with_refs)) == "leaf_v2"
+
+    def test_file_changed_during_load(self, project):
+        """Test a file saved after it was read does not validate the entry."""
+        top, leaf = project
+
+        def loader_with_concurrent_save(path, **kwargs):
+            data = load_json_with_refs(path, **kwargs)
+            write_json(leaf, {"name": "leaf_v2"})
+            return data
+
+        assert leaf_name(load_with_cache(top, loader_with_concurrent_save)) == "leaf"
+        assert leaf_name(load_with_cache(top, load_json_with_refs)) == "leaf_v2"
+
+    def test_root_through_symlinked_directory(self, tmp_path, monkeypatch):
+        """Test a root path with '..' after a symlink loads what the OS opens."""
+        monkeypatch.setattr(resolved_cache, "CACHE_DIR", tmp_path / "cache")
+        (tmp_path / "real" / "sub").mkdir(parents=True)
+        (tmp_path / "p").mkdir()
+        write_json(tmp_path / "real" / "top.json", {"name": "top_real"})
+        write_json(tmp_path / "p" / "top.json", {"name": "top_p"})
+        try:
+            os.symlink(os.path.join("..", "real", "sub"), tmp_path / "p" / "sub")
+        except (OSError, NotImplementedError):
+            pytest.skip("symlinks are not supported here")
+
+        root = tmp_path / "p" / "sub" / ".." / "top.json"
+        assert load_with_cache(root, load_json_with_refs)["name"] == "top_real"
+        assert load_with_cache(root, failing_loader)["name"] == "top_real"
+
+    def test_no_cache(self, project):
+        """Test use_cache=False neither reads nor writes an entry."""
+        top, _ = project
+        load_with_cache(top, load_json_with_refs, use_cache=False)
+        assert not resolved_cache.CACHE_DIR.exists()
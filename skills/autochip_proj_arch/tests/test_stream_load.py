@@ -0,0 +1,78 @@
+"""Tests for streaming large module JSON files with ijson."""
+
+import json
+
+import pytest
+
+pytest.importorskip("ijson")
+
+from scripts import stream_load
+from scripts.extract_modules import extract_modules_from_path
+from scripts.extract_testcases import extract_testcases_from_path
+from scripts.stream_load import stream_module_tree
+
+
+def make_module(name, depth):
+    """Build a module tree with extra keys the extractors never read."""
+    module = {
+        "name": name,
+        "filepath": f"./src/{name}.v",
+        "docpath": f"./docs/{name}.md",
+        "params": {"WIDTH": 32, "GAIN": 0.5, "TAGS": ["a", None, True]},
+        "test": {
+            "testbench_path": f"./test/tb_{name}.sv",
+            "test_case": [
+                {
+                    "name": f"{name}_smoke",
+                    "run_cmd": f"make test_{name} ARGS=\"\\u00e9\"",
+                    "output_log_path": [f"./log/{name}.log"],
+                    "output_wave_path": f"./wave/{name}.vcd",
+                },
+            ],
+        },
+        "submodules": None,
+    }
+    if depth:
+        module["submodules"] = [make_module(f"{name}_{i}", depth - 1) for i in range(3)]
+    return module
+
+
+@pytest.fixture
+def large_json(tmp_path, monkeypatch):
+    """A ref-free module file that is always streamed."""
+    monkeypatch.setattr(stream_load, "STREAM_MIN_SIZE", 0)
+    path = tmp_path / "top.json"
+    path.write_text(json.dumps(make_module("top", 3)))
+    return path
+
+
+class TestStreamModuleTree:
+    """Tests for stream_module_tree and the --stream extract paths."""
+
+    def test_modules_match(self, large_json):
+        """Test streamed and fully loaded module extraction match."""
+        assert stream_module_tree(large_json, ("name",)) is not None
+        streamed = extract_modules_from_path(large_json, use_cache=False, stream=True)
+        loaded = extract_modules_from_path(large_json, use_cache=False)
+        assert streamed == loaded
+        assert len(streamed) == 1 + 3 + 9 + 27
+
+    def test_testcases_match(self, large_json):
+        """Test streamed and fully loaded test case extraction match."""
+        streamed = extract_testcases_from_path(large_json, use_cache=False, stream=True)
+        loaded = extract_testcases_from_path(large_json, use_cache=False)
+        assert streamed == loaded
+        assert len(streamed) == 40
+
+    def test_ref_falls_back(self, tmp_path, monkeypatch):
+        """Test a file containing $ref is left to the resolving loader."""
+        monkeypatch.setattr(stream_load, "STREAM_MIN_SIZE", 0)
+        path = tmp_path / "top.json"
+        path.write_text(json.dumps({"name": "top", "submodules": [{"$ref": "./leaf.json"}]}))
+        assert stream_module_tree(path, ("name",)) is None
+
+    def test_small_file_falls_back(self, tmp_path):
+        """Test files below STREAM_MIN_SIZE are not streamed."""
+        path = tmp_path / "top.json"
+        path.write_text(json.dumps(make_module("top", 0)))
+        assert stream_module_tree(path, ("name",)) is None
@@ -0,0 +1,146 @@
+"""Tests for validating module JSON files against the schema."""
+
+import json
+import os
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+jsonschema = pytest.importorskip("jsonschema")
+
+from scripts import validate_schema
+from scripts.validate_schema import build_validator, validate_json
+
+SKILL_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_PATH = SKILL_DIR / "autochip_module_schema.json"
+EXAMPLE_DIR = SKILL_DIR.parent.parent / "example" / "autochip" / "meta"
+
+
+def module(name, **extra):
+    """Build a minimal valid module."""
+    return {"name": name, "filepath": f"./src/{name}.v", "docpath": f"./docs/{name}.md", **extra}
+
+
+INVALID_MODULES = {
+    "missing_required": {"name": "alu", "filepath": "./src/alu.v"},
+    "wrong_type": module("alu", submodules="alu.json"),
+    "bad_test_case": module("alu", test={"testbench_path": "./tb.sv", "test_case": [{"name": "t"}]}),
+}
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data))
+    return path
+
+
+def expected_message(data):
+    """The error validate_json reported when it used jsonschema.validate."""
+    schema = json.loads(SCHEMA_PATH.read_text())
+    with pytest.raises(jsonschema.ValidationError) as exc_info:
+        jsonschema.validate(data, schema)
+    e = exc_info.value
+    error_path = ' -> '.join(str(p) for p in e.path) if e.path else 'root'
+    return f"Validation error at '{error_path}': {e.message}"
+
+
+@pytest.fixture(autouse=True)
+def fresh_validator_cache(monkeypatch):
+    """Give every test its own, empty validator cache."""
+    monkeypatch.setattr(validate_schema, "_validator_cache", {})
+
+
+class TestValidateJson:
+    """Tests for validate_json."""
+
+    def test_valid_file(self):
+        """Test an example module with $refs validates."""
+        assert validate_json(SCHEMA_PATH, EXAMPLE_DIR / "cpu.json", use_cache=False) == (True, None)
+
+    @pytest.mark.parametrize("case", sorted(INVALID_MODULES))
+    def test_invalid_file_message(self, tmp_path, case):
+        """Test the reported error matches jsonschema.validate."""
+        data = INVALID_MODULES[case]
+        path = write_json(tmp_path / "module.json", data)
+        assert validate_json(SCHEMA_PATH, path, use_cache=False) == (False, expected_message(data))
+
+    def test_prebuilt_validator(self, tmp_path):
+        """Test a validator from build_validator is reused without the schema."""
+        validator = build_validator(SCHEMA_PATH)
+        missing_schema = tmp_path / "missing_schema.json"
+        valid = write_json(tmp_path / "valid.json", module("alu"))
+        invalid = write_json(tmp_path / "invalid.json", INVALID_MODULES["missing_required"])
+
+        assert validate_json(missing_schema, valid, validator=validator, use_cache=False) == (True, None)
+        assert validate_json(missing_schema, invalid, validator=validator, use_cache=False) == (
+            False, expected_message(INVALID_MODULES["missing_required"]))
+
+
+class TestSchemaRefs:
+    """Tests for the schema's own refs, served from the validator's registry."""
+
+    @pytest.fixture(autouse=True)
+    def no_network(self, monkeypatch):
+        """Fail any attempt to fetch the schema's $id over the network."""
+        def urlopen(*args, **kwargs):
+            raise AssertionError("schema ref was fetched instead of served from the registry")
+        monkeypatch.setattr(urllib.request, "urlopen", urlopen)
+
+    def test_recursive_ref(self, tmp_path):
+        """Test nested submodules are checked through the recursive '#' ref."""
+        valid = module("top", submodules=[module("mid", submodules=[module("leaf")])])
+        invalid = module("top", submodules=[module("mid", submodules=[{"name": "leaf", "filepath": "./leaf.v"}])])
+
+        path = write_json(tmp_path / "valid.json", valid)
+        assert validate_json(SCHEMA_PATH, path, use_cache=False) == (True, None)
+        path = write_json(tmp_path / "invalid.json", invalid)
+        assert validate_json(SCHEMA_PATH, path, use_cache=False) == (False, expected_message(invalid))
+
+    def test_recursive_ref_without_id(self, tmp_path):
+        """Test '#' also resolves for a schema that has no $id."""
+        schema = json.loads(SCHEMA_PATH.read_text())
+        del schema["$id"]
+        schema_path = write_json(tmp_path / "schema.json", schema)
+        valid = write_json(tmp_path / "valid.json", module("top", submodules=[module("leaf")]))
+        invalid = write_json(tmp_path / "invalid.json", module("top", submodules=[{"name": "leaf"}]))
+
+        assert validate_json(schema_path, valid, use_cache=False) == (True, None)
+        assert validate_json(schema_path, invalid, use_cache=False)[0] is False
+
+
+class TestValidatorCache:
+    """Tests for reusing validators built by validate_json."""
+
+    @pytest.fixture
+    def builds(self, monkeypatch):
+        """Record the schema path of every validator build."""
+        calls = []
+
+        def counting_build_validator(schema_path):
+            calls.append(schema_path)
+            return build_validator(schema_path)
+
+        monkeypatch.setattr(validate_schema, "build_validator", counting_build_validator)
+        return calls
+
+    def test_reused(self, tmp_path, builds):
+        """Test repeated validations against one schema build it once."""
+        path = write_json(tmp_path / "module.json", module("alu"))
+        for _ in range(3):
+            assert validate_json(SCHEMA_PATH, path, use_cache=False) == (True, None)
+        assert len(builds) == 1
+        assert len(validate_schema._validator_cache) == 1
+
+    def test_rebuilt_after_schema_change(self, tmp_path, builds):
+        """Test a schema whose mtime changed is compiled again."""
+        schema = json.loads(SCHEMA_PATH.read_text())
+        schema_path = write_json(tmp_path / "schema.json", schema)
+        os.utime(schema_path, ns=(10 ** 18, 10 ** 18))
+        path = write_json(tmp_path / "module.json", {"name": "alu", "filepath": "./src/alu.v"})
+        assert validate_json(schema_path, path, use_cache=False)[0] is False
+
+        schema["required"] = ["name", "filepath"]
+        write_json(schema_path, schema)
+        os.utime(schema_path, ns=(10 ** 18 + 10 ** 9, 10 ** 18 + 10 ** 9))
+        assert validate_json(schema_path, path, use_cache=False) == (True, None)
+        assert len(builds) == 2